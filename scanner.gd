@@ -13,6 +13,9 @@ extends Node3D
 @export var move_speed = 8.0
 @export var min_color_dist = 0.0
 @export var max_color_dist = 5.0
+## Also save each scan as a compact binary file (.bin) that visualize.py
+## can load without parsing text.
+@export var save_binary = false
 
 # --- Node References ---
 @onready var camera_3d: Camera3D = $Camera
@@ -26,6 +29,10 @@ extends Node3D
 
 # --- Scan Saving ---
 const SCAN_FOLDER = "scans"
+# Binary format, mirrored by BIN_VERSION / BIN_HEADER_DTYPE / BIN_POINT_DTYPE in visualize.py
+const BIN_MAGIC = "LIDARBIN"
+const BIN_VERSION = 1
+const BIN_NAME_WIDTH = 32
 var scan_counter = 0
 
 var point_cloud_data: Array = []
@@ -144,6 +151,8 @@ func _input(event: InputEvent):
 		var file_name = "point_cloud_categorized_%d.txt" % scan_counter
 		var full_path = SCAN_FOLDER.path_join(file_name)
 		save_to_file(full_path)
+		if save_binary:
+			save_to_binary_file(full_path.get_basename() + ".bin")
 
 
 func _update_hud():
@@ -252,3 +261,55 @@ func save_to_file(file_path: String):
 	var success_msg = "Successfully saved %d points to %s" % [point_cloud_data.size(), file_path.get_file()]
 	print(success_msg)
 	scan_log_label.text = success_msg
+
+
+func save_to_binary_file(file_path: String):
+	if point_cloud_data.is_empty():
+		var msg = "Point cloud data is empty. Nothing to save."
+		print(msg)
+		scan_log_label.text = msg
+		return
+
+	var file = FileAccess.open(file_path, FileAccess.WRITE)
+	if not file:
+		var msg = "Error: Could not open file '%s' for writing." % file_path
+		print(msg)
+		scan_log_label.text = msg
+		return
+
+	# Give each object a category index, in order of first appearance.
+	var categories = {}
+	var names = []
+	for point_data in point_cloud_data:
+		if not categories.has(point_data.name):
+			categories[point_data.name] = names.size()
+			names.append(point_data.name)
+
+	# --- Write Header ---
+	var pos = self.global_position
+	file.store_buffer(BIN_MAGIC.to_ascii_buffer())
+	file.store_32(BIN_VERSION)
+	file.store_32(point_cloud_data.size())
+	file.store_32(names.size())
+	file.store_float(pos.x)
+	file.store_float(pos.y)
+	file.store_float(pos.z)
+	file.store_float(self.rotation.y)
+	file.store_float(camera_3d.rotation.x)
+
+	# --- Write Name Table (NUL-padded) ---
+	for object_name in names:
+		var name_bytes = str(object_name).to_ascii_buffer()
+		name_bytes.resize(BIN_NAME_WIDTH)
+		file.store_buffer(name_bytes)
+
+	# --- Write Points ---
+	for point_data in point_cloud_data:
+		file.store_float(point_data.pos.x)
+		file.store_float(point_data.pos.y)
+		file.store_float(point_data.pos.z)
+		file.store_16(categories[point_data.name])
+
+	var success_msg = "Successfully saved %d points to %s" % [point_cloud_data.size(), file_path.get_file()]
+	print(success_msg)
+	scan_log_label.text = success_msg
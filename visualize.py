@@ -1,9 +1,24 @@
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 import numpy as np
 import os
+import re
 import sys
 import glob
-from collections import defaultdict
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; a Python parser is used without it
+    njit = None
+
+try:
+    from vispy import app, scene
+    from vispy.scene import visuals
+except ImportError:  # VisPy is optional; large scans then use Matplotlib too
+    scene = None
 
 # ---------------------------------------------------------------------------
 # Coordinate System Notes
@@ -11,187 +26,792 @@ from collections import defaultdict
 # Matplotlib's mplot3d assumes Z is "up" (vertical on screen) in its default
 # rendering. Godot (and many 3D engines) use a right‑handed system with Y up.
 # To display data in a right‑handed Y‑up frame inside Matplotlib we:
-#   1. Keep data in native (X, Y, Z) with Y as up.
-#   2. When plotting, swap axes so that (X, Z, Y) is passed to Matplotlib,
-#      because Matplotlib's Z axis is the vertical one we want to represent Y.
+#   1. Keep data in native (X, Y, Z) with Y as up while loading.
+#   2. Right after loading, reorder the columns once so that (-X, Z, Y) is
+#      what gets plotted, because Matplotlib's Z axis is the vertical one we
+#      want to represent Y. Every plot call then reads plain, contiguous
+#      columns, and the overlays go through the same mapping (to_display).
 #   3. Relabel the axes so users see X (right), Z (forward/depth), Y (up).
 #   4. (Optional) Invert the depth axis if you prefer -Z forward conventions.
 # This preserves a right‑handed orientation: X × Y = Z.
 
 Y_UP_DISPLAY = True  # Toggle if you want raw Matplotlib (Z up) instead.
 
+# World (X, Y, Z) -> display axes: column order, per-column sign and labels
+if Y_UP_DISPLAY:
+    DISPLAY_ORDER = [0, 2, 1]
+    DISPLAY_SIGN = np.array([-1, 1, 1], np.float32)
+    DISPLAY_LABELS = ("X (Right)", "Z (Forward/Depth)", "Y (Up)")
+else:
+    DISPLAY_ORDER = [0, 1, 2]
+    DISPLAY_SIGN = np.array([1, 1, 1], np.float32)
+    DISPLAY_LABELS = ("X", "Y", "Z")
+
+NAME_WIDTH = 32  # Bytes per name in the binary name table (see scanner.gd)
+DOME_POINT_LIMIT = 200_000  # Skip the dome wireframe for scans this dense
+VISPY_POINT_LIMIT = 200_000  # Render larger scans with VisPy when installed
+VOXEL_SIZE = None  # Voxel edge in meters to downsample by (e.g. 0.01), or None
+CACHE_VERSION = 1  # Bump when the text parse changes, so old ".npz" caches are redone
+
+# Text scan header: "# SCANNER_POS: x y z" and "# SCANNER_ROT: yaw pitch"
+# comment lines ahead of the first point line
+HEADER_LINE = re.compile(rb"^[ \t]*# SCANNER_(POS|ROT):(.*)$", re.MULTILINE)
+FIRST_POINT_LINE = re.compile(rb"^[ \t]*[^#\s]", re.MULTILINE)
+HEADER_CHUNK = 4096  # Bytes read at a time while looking for the header end
+
+# A well-formed "x y z name" point line, with numbers as _parse_points reads
+# them; used to drop malformed lines when Numba is not available
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+POINT_LINE = re.compile(
+    rf"[ \t]*{_NUMBER}[ \t]+{_NUMBER}[ \t]+{_NUMBER}[ \t]+\S+[ \t]*"
+)
 
-def visualize_point_cloud(file_path):
+# Binary scan format (".bin", written by scanner.gd when save_binary is on):
+# a fixed header, a table of NUL-padded object names, then packed point
+# records whose category indexes into that table. All values little-endian.
+BIN_MAGIC = b"LIDARBIN"
+BIN_VERSION = 1  # Bumped by scanner.gd whenever the layout changes
+BIN_HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("point_count", "<u4"),
+        ("name_count", "<u4"),
+        ("scanner_pos", "<f4", (3,)),
+        ("scanner_rot", "<f4", (2,)),  # yaw, pitch in radians
+    ]
+)
+BIN_POINT_DTYPE = np.dtype([("xyz", "<f4", (3,)), ("cat", "<u2")])
+
+
+def to_display(points):
     """
-    Loads and displays a categorized 3D point cloud as a scatter plot,
-    visualizing the sensor's range with a dome and floor.
+    Maps world (X, Y, Z) coordinates, stored along the last axis, to the
+    display axes. Returns a new contiguous array.
     """
-    if not os.path.exists(file_path):
-        print(f"Error: File not found at '{file_path}'")
-        return
+    return points[..., DISPLAY_ORDER] * DISPLAY_SIGN
+
+
+# Unit-radius floor circle (N, 3) and dome (hemisphere) grid (U, V, 3), in
+# display axes. These never change between scans, so they are built once and
+# only scaled by the dome radius. The dome is only a range indicator, so a
+# coarse grid looks the same as a dense one while giving mplot3d far fewer
+# segments.
+_FLOOR_THETA = np.linspace(0, 2 * np.pi, 100, dtype=np.float32)
+UNIT_FLOOR = to_display(
+    np.stack(
+        [np.cos(_FLOOR_THETA), np.zeros_like(_FLOOR_THETA), np.sin(_FLOOR_THETA)],
+        axis=-1,
+    )
+)
+_DOME_U = np.linspace(0, 2 * np.pi, 16, dtype=np.float32)
+_DOME_V = np.linspace(0, np.pi / 2, 8, dtype=np.float32)
+UNIT_DOME = to_display(
+    np.stack(
+        [
+            np.outer(np.cos(_DOME_U), np.sin(_DOME_V)),
+            np.outer(np.ones(np.size(_DOME_U), np.float32), np.cos(_DOME_V)),
+            np.outer(np.sin(_DOME_U), np.sin(_DOME_V)),
+        ],
+        axis=-1,
+    )
+)
+# Dome quads (F, 4, 3) between neighbouring grid points, and each quad's
+# outward normal, which on a unit sphere is just its normalized centre
+UNIT_DOME_FACES = np.stack(
+    [UNIT_DOME[:-1, :-1], UNIT_DOME[1:, :-1], UNIT_DOME[1:, 1:], UNIT_DOME[:-1, 1:]],
+    axis=2,
+).reshape(-1, 4, 3)
+_DOME_CENTRES = UNIT_DOME_FACES.mean(axis=1)
+UNIT_DOME_NORMALS = _DOME_CENTRES / np.linalg.norm(_DOME_CENTRES, axis=1, keepdims=True)
 
-    objects = defaultdict(list)
+
+def visible_dome_faces(faces, normals, elev, azim):
+    """
+    Returns the faces whose outward normals point towards a camera at the
+    given mplot3d elevation and azimuth (degrees); the far side of the dome
+    is culled. Assumes equal axis scales, so display-space normals match
+    what is on screen.
+    """
+    elev, azim = np.deg2rad(elev), np.deg2rad(azim)
+    view_dir = np.array(
+        [np.cos(elev) * np.cos(azim), np.cos(elev) * np.sin(azim), np.sin(elev)],
+        np.float32,
+    )
+    return faces[normals @ view_dir > 0]
+
+
+def read_scan_header(file_path):
+    """
+    Reads the scanner position and rotation from the comment block at the
+    top of a scan file. Only the bytes ahead of the first point line are
+    read, and the header lines are picked out with one compiled regex.
+    """
     scanner_pos = np.array([0.0, 0.0, 0.0])  # Default to origin
     scanner_rot_deg = (0.0, 0.0)  # Default yaw, pitch in degrees for display
     yaw_rad = 0.0  # Default yaw in radians for calculation
 
-    try:
-        with open(file_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                # Parse header for scanner position and rotation
-                if line.startswith("# SCANNER_POS:"):
-                    scanner_pos = np.array([float(x) for x in line.split()[2:]])
-                elif line.startswith("# SCANNER_ROT:"):
-                    # Read yaw and pitch in radians
-                    yaw_rad, pitch_rad = [float(x) for x in line.split()[2:]]
-                    # Store degrees for display title
-                    # yaw_rad = (yaw_rad - np.pi / 2) % (2 * np.pi)
-                    scanner_rot_deg = (np.rad2deg(yaw_rad), np.rad2deg(pitch_rad))
-                elif line and not line.startswith("#"):
-                    parts = line.split()
-                    if len(parts) == 4:
-                        x, y, z = float(parts[0]), float(parts[1]), float(parts[2])
-                        name = parts[3]
-                        objects[name].append([x, y, z])
-
-        if not objects:
-            print(f"Error: No valid point data found in '{file_path}'.")
-            return
+    # Read just enough of the file to reach the first point line
+    with open(file_path, "rb") as f:
+        head = f.read(HEADER_CHUNK)
+        while not FIRST_POINT_LINE.search(head):
+            chunk = f.read(HEADER_CHUNK)
+            if not chunk:
+                break
+            head += chunk
+    first_point = FIRST_POINT_LINE.search(head)
+    if first_point:
+        head = head[: first_point.start()]
+
+    for kind, values in HEADER_LINE.findall(head):
+        values = [float(x) for x in values.split()]
+        if kind == b"POS":
+            scanner_pos = np.array(values)
+        else:
+            # Read yaw and pitch in radians
+            yaw_rad, pitch_rad = values
+            # Store degrees for display title
+            # yaw_rad = (yaw_rad - np.pi / 2) % (2 * np.pi)
+            scanner_rot_deg = (np.rad2deg(yaw_rad), np.rad2deg(pitch_rad))
+
+    return scanner_pos, scanner_rot_deg, yaw_rad
+
+
+# Name hash: polynomial over the name's bytes modulo a 31-bit prime, so the
+# intermediate values never overflow int64 (in Numba or in plain Python).
+_HASH_BASE = 257
+_HASH_MOD = 2_147_483_647
 
-        # Convert to numpy arrays and make points relative to the scanner's position
-        for name in objects:
-            objects[name] = np.array(objects[name]) - scanner_pos
 
-        fig = plt.figure(figsize=(14, 10))
-        ax = fig.add_subplot(111, projection="3d")
-        colors = plt.cm.get_cmap("gist_rainbow", len(objects))
+def _parse_points(buf, max_points):
+    """
+    Walks the raw bytes of a scan file and parses every "x y z name" line.
+    Comment lines and malformed lines are skipped. Each name is interned to
+    a small integer label as it is read, keyed by a hash of its bytes.
+    Returns the (n, 3) float32 coordinates, the (n,) labels, and the byte
+    offset and length in buf of each label's name.
+    Compiled with Numba when it is available (see load_scan_points).
+    """
+    # float32 is plenty for display (sub-mm at 100 m) and halves the bytes
+    # that every reduction and every mplot3d re-projection has to move.
+    coords = np.empty((max_points, 3), np.float32)
+    labels = np.empty(max_points, np.int32)
+    # Name hash -> (label, byte offset, length) of each distinct name; scans
+    # have few, so this stays small however many points there are
+    name_ids = {}
+    name_count = 0
+    size = buf.shape[0]
+    n = 0
+    i = 0
+    while i < size:
+        # Skip leading whitespace and blank lines
+        c = buf[i]
+        if c == 32 or c == 9 or c == 13 or c == 10:
+            i += 1
+            continue
+        # Header/comment line
+        if c == 35:  # '#'
+            while i < size and buf[i] != 10:
+                i += 1
+            continue
+
+        ok = True
+        for k in range(3):
+            while i < size and (buf[i] == 32 or buf[i] == 9):
+                i += 1
+            sign = 1.0
+            if i < size and (buf[i] == 45 or buf[i] == 43):  # '-' / '+'
+                if buf[i] == 45:
+                    sign = -1.0
+                i += 1
+            value = 0.0
+            digits = 0
+            while i < size and 48 <= buf[i] <= 57:
+                value = value * 10.0 + (buf[i] - 48)
+                digits += 1
+                i += 1
+            if i < size and buf[i] == 46:  # '.'
+                i += 1
+                frac_digits = 0
+                while i < size and 48 <= buf[i] <= 57:
+                    value = value * 10.0 + (buf[i] - 48)
+                    frac_digits += 1
+                    i += 1
+                digits += frac_digits
+                value /= 10.0**frac_digits
+            if i < size and (buf[i] == 101 or buf[i] == 69):  # 'e' / 'E'
+                i += 1
+                exp_sign = 1
+                if i < size and (buf[i] == 45 or buf[i] == 43):
+                    if buf[i] == 45:
+                        exp_sign = -1
+                    i += 1
+                exponent = 0
+                exp_digits = 0
+                while i < size and 48 <= buf[i] <= 57:
+                    exponent = exponent * 10 + (buf[i] - 48)
+                    exp_digits += 1
+                    i += 1
+                if exp_digits == 0:
+                    ok = False
+                value *= 10.0 ** (exp_sign * exponent)
+            # A number must have digits and be followed by whitespace
+            if digits == 0 or i >= size or not (buf[i] == 32 or buf[i] == 9):
+                ok = False
+            if not ok:
+                break
+            coords[n, k] = sign * value
 
-        # --- Plot each object's points ---
-        for i, (name, points) in enumerate(objects.items()):
-            if Y_UP_DISPLAY:
-                # points: (X, Y, Z) with Y up. Map to (X, Z, Y) so Matplotlib's Z shows Y.
-                x_vals, y_up, z_vals = points[:, 0], points[:, 1], points[:, 2]
-                ax.scatter(-x_vals, z_vals, y_up, s=10, label=name, color=colors(i))
+        if ok:
+            # Name token
+            while i < size and (buf[i] == 32 or buf[i] == 9):
+                i += 1
+            start = i
+            while i < size and not (
+                buf[i] == 32 or buf[i] == 9 or buf[i] == 13 or buf[i] == 10
+            ):
+                i += 1
+            length = i - start
+            # Nothing but whitespace may follow the name
+            while i < size and (buf[i] == 32 or buf[i] == 9 or buf[i] == 13):
+                i += 1
+            if length == 0 or (i < size and buf[i] != 10):
+                ok = False
             else:
-                # Standard Matplotlib Z‑up (no remap)
-                ax.scatter(
-                    points[:, 0],
-                    points[:, 1],
-                    points[:, 2],
-                    s=10,
-                    label=name,
-                    color=colors(i),
-                )
+                key = 0
+                for j in range(start, start + length):
+                    key = (key * _HASH_BASE + np.int64(buf[j])) % _HASH_MOD
+                while True:
+                    if key not in name_ids:
+                        # First time this name is seen
+                        label = name_count
+                        name_ids[key] = (label, start, length)
+                        name_count += 1
+                        break
+                    # Make sure it is the same name and not a hash collision;
+                    # on a collision, probe the next key.
+                    label, name_start, name_length = name_ids[key]
+                    same = name_length == length
+                    j = 0
+                    while same and j < length:
+                        same = buf[name_start + j] == buf[start + j]
+                        j += 1
+                    if same:
+                        break
+                    key = (key + 1) % _HASH_MOD
+                labels[n] = label
+                n += 1
 
-        # --- Calculate max range and draw dome/floor ---
-        all_points = np.vstack(list(objects.values()))
-        distances = np.linalg.norm(all_points, axis=1)
-        max_dist = np.max(distances)
-        dome_radius = max_dist * 1.05  # Add a small buffer
-
-        # --- Draw Front Indicator Line (Rotated by Yaw) ---
-        # Godot's +Z is the initial front, which maps to Matplotlib's +Y axis.
-        # We rotate this vector around the Y-up axis (Matplotlib's Z-up) by the yaw.
-        # But since the line is on the floor (Z=0), it's a simple 2D rotation.
-        # Godot X maps to plot X, Godot Z maps to plot Y.
-        # Rotation of (0,1) by yaw: x' = sin(yaw), y' = cos(yaw)
-        front_x = -dome_radius * np.sin(yaw_rad)
-        front_z_depth = dome_radius * np.cos(yaw_rad)
-        if Y_UP_DISPLAY:
-            ax.plot(
-                [0, front_x],  # X
-                [0, front_z_depth],  # Y axis in plot = world Z (depth)
-                [0, 0],  # Z axis in plot = world Y (up)
-                color="red",
-                linewidth=2.5,
-                label="Front Direction",
-            )
-        else:
-            ax.plot(
-                [0, front_x],
-                [0, 0],
-                [0, front_z_depth],
-                color="red",
-                linewidth=2.5,
-                label="Front Direction",
-            )
+        # Move on to the next line
+        while i < size and buf[i] != 10:
+            i += 1
+
+    name_starts = np.empty(name_count, np.int64)
+    name_lengths = np.empty(name_count, np.int64)
+    for label, name_start, name_length in name_ids.values():
+        name_starts[label] = name_start
+        name_lengths[label] = name_length
+    return (
+        coords[:n],
+        labels[:n],
+        name_starts,
+        name_lengths,
+    )
+
+
+if njit is not None:
+    # nogil lets the parse run alongside Matplotlib's startup (see
+    # visualize_point_cloud)
+    _parse_points = njit(cache=True, nogil=True)(_parse_points)
+
+
+def load_scan_points(file_path):
+    """
+    Loads the point lines of a scan file. Returns the (N, 3) float32
+    coordinates, the unique object names and, per point, the index of its
+    name in unique_names.
+    """
+    if njit is not None:
+        # Numba path: parse the raw bytes in one compiled pass straight into
+        # buffers preallocated from the line count (an upper bound for the
+        # number of points), then keep only the rows that were filled.
+        with open(file_path, "rb") as f:
+            data = f.read()
+        buf = np.frombuffer(data, dtype=np.uint8)
+        max_points = data.count(b"\n") + 1
+        # Names come back already interned, so only the few distinct ones
+        # are decoded here.
+        coords, label_ids, name_starts, name_lengths = _parse_points(buf, max_points)
+        unique_names = np.array(
+            [
+                data[start : start + length].decode()
+                for start, length in zip(name_starts, name_lengths)
+            ],
+            dtype=str,
+        )
+        return coords, unique_names, label_ids
+
+    # Fallback: bulk-load the point lines with NumPy's C tokenizer; comment
+    # lines (the header) are skipped automatically. The name field is as
+    # wide as the longest line, so no name is cut short.
+    with open(file_path, "r") as f:
+        lines = f.read().splitlines()
+    scan_dtype = [("xyz", "f4", (3,)), ("name", f"U{max(map(len, lines), default=1)}")]
+    try:
+        raw = np.loadtxt(lines, comments="#", dtype=scan_dtype, ndmin=1)
+    except ValueError:
+        # Some lines are not "x y z name"; skip them as the Numba parser does
+        point_lines = [line for line in lines if POINT_LINE.fullmatch(line)]
+        raw = np.loadtxt(point_lines, comments="#", dtype=scan_dtype, ndmin=1)
+    coords = np.ascontiguousarray(raw["xyz"])
+
+    # np.unique sorts the names; renumber them in first-seen order so labels
+    # and colors match the Numba path.
+    names, first_seen, label_ids = np.unique(
+        raw["name"], return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_seen)
+    rank = np.empty(len(order), np.int32)
+    rank[order] = np.arange(len(order))
+    unique_names = names[order]
+    label_ids = rank[label_ids]
+    return coords, unique_names, label_ids
+
+
+def _point_stats(pts):
+    """
+    Single sweep over the (N, 3) points returning the largest distance from
+    the origin and the per-axis min, max and mean. Compiled with Numba when
+    it is available (see point_stats).
+    """
+    max_sq = 0.0
+    mins = np.empty(3)
+    maxs = np.empty(3)
+    sums = np.zeros(3)
+    for k in range(3):
+        mins[k] = pts[0, k]
+        maxs[k] = pts[0, k]
+    for i in range(pts.shape[0]):
+        x, y, z = pts[i, 0], pts[i, 1], pts[i, 2]
+        d = x * x + y * y + z * z
+        if d > max_sq:
+            max_sq = d
+        if x < mins[0]:
+            mins[0] = x
+        if x > maxs[0]:
+            maxs[0] = x
+        if y < mins[1]:
+            mins[1] = y
+        if y > maxs[1]:
+            maxs[1] = y
+        if z < mins[2]:
+            mins[2] = z
+        if z > maxs[2]:
+            maxs[2] = z
+        sums[0] += x
+        sums[1] += y
+        sums[2] += z
+    return np.sqrt(max_sq), mins, maxs, sums / pts.shape[0]
+
+
+if njit is not None:
+    _point_stats = njit(cache=True, fastmath=True)(_point_stats)
+
+
+def point_stats(all_points):
+    """
+    Returns (max_dist, mins, maxs, means) for the points: the largest
+    distance from the scanner and the per-axis bounds and centroid.
+    """
+    if njit is not None:
+        # One fused pass, without any (N,) or (N, 3) temporaries. The kernel
+        # accumulates in float64; hand back float32 like the NumPy path.
+        max_dist, mins, maxs, means = _point_stats(all_points)
+        return (
+            np.float32(max_dist),
+            mins.astype(np.float32),
+            maxs.astype(np.float32),
+            means.astype(np.float32),
+        )
+
+    # einsum gives the squared norms without the (N, 3) temporary that
+    # np.linalg.norm would allocate.
+    mins, maxs = all_points.min(axis=0), all_points.max(axis=0)
+    means = all_points.mean(axis=0)
+    max_dist = np.sqrt(np.einsum("ij,ij->i", all_points, all_points).max())
+    return max_dist, mins, maxs, means
+
+
+def load_binary_scan(file_path):
+    """
+    Loads a ".bin" scan. The point records are memory-mapped copy-on-write,
+    so coordinates and categories are zero-copy views of the file and no
+    text is converted. Returns the same tuple as load_scan.
+    """
+    header = np.fromfile(file_path, dtype=BIN_HEADER_DTYPE, count=1)
+    if len(header) == 0 or header[0]["magic"] != BIN_MAGIC:
+        raise ValueError(f"'{file_path}' is not a binary LiDAR scan.")
+    header = header[0]
+    if header["version"] != BIN_VERSION:
+        raise ValueError(
+            f"'{file_path}' is binary scan version {header['version']}, "
+            f"expected {BIN_VERSION}."
+        )
+
+    names_offset = BIN_HEADER_DTYPE.itemsize
+    name_count = int(header["name_count"])
+    point_count = int(header["point_count"])
+    points_offset = names_offset + name_count * NAME_WIDTH
+    expected_size = points_offset + point_count * BIN_POINT_DTYPE.itemsize
+    file_size = os.path.getsize(file_path)
+    if file_size != expected_size:
+        raise ValueError(
+            f"'{file_path}' is {file_size} bytes but its header describes "
+            f"{expected_size} bytes; the scan is truncated or corrupt."
+        )
+
+    unique_names = np.fromfile(
+        file_path, dtype=f"S{NAME_WIDTH}", count=name_count, offset=names_offset
+    ).astype(str)
+
+    if point_count:
+        records = np.memmap(
+            file_path,
+            dtype=BIN_POINT_DTYPE,
+            mode="c",
+            offset=points_offset,
+            shape=(point_count,),
+        )
+        all_points, label_ids = records["xyz"], records["cat"]
+    else:
+        all_points = np.empty((0, 3), np.float32)
+        label_ids = np.empty(0, np.uint16)
+
+    scanner_pos = header["scanner_pos"].astype(np.float64)
+    yaw_rad, pitch_rad = (float(x) for x in header["scanner_rot"])
+    scanner_rot_deg = (np.rad2deg(yaw_rad), np.rad2deg(pitch_rad))
+    return all_points, unique_names, label_ids, scanner_pos, scanner_rot_deg, yaw_rad
 
-        # Create the floor circle
-        theta = np.linspace(0, 2 * np.pi, 100)
-        floor_x = dome_radius * np.cos(theta)
-        floor_z_depth = dome_radius * np.sin(theta)
-        if Y_UP_DISPLAY:
-            ax.plot(
-                floor_x,
-                floor_z_depth,  # depth on Matplotlib Y
-                0,  # up (Y) on Matplotlib Z
-                color="gray",
-                linestyle="--",
-                label="Sensor Floor Range",
-            )
-        else:
-            ax.plot(
-                floor_x,
-                0,
-                floor_z_depth,
-                color="gray",
-                linestyle="--",
-                label="Sensor Floor Range",
-            )
 
-        # Create the hemisphere (dome)
-        u = np.linspace(0, 2 * np.pi, 50)
-        v = np.linspace(0, np.pi / 2, 50)
-        dome_x = dome_radius * np.outer(np.cos(u), np.sin(v))
-        dome_z_depth = dome_radius * np.outer(np.sin(u), np.sin(v))
-        dome_y_up = dome_radius * np.outer(np.ones(np.size(u)), np.cos(v))
-        if Y_UP_DISPLAY:
-            ax.plot_wireframe(
-                dome_x,
-                dome_z_depth,
-                dome_y_up,
-                color="gray",
-                alpha=0.3,
-                rstride=5,
-                cstride=5,
+def load_scan(file_path):
+    """
+    Loads a scan file's header and points. Binary ".bin" scans are mapped
+    directly. Text scans are parsed once and cached in a ".npz" file next to
+    the scan, which is reused as long as it is newer than the scan and
+    matches CACHE_VERSION, so viewing the same scan again skips the text
+    parse.
+    Returns (points, unique_names, label_ids, scanner_pos, scanner_rot_deg,
+    yaw_rad), with points still in world coordinates.
+    """
+    if file_path.endswith(".bin"):
+        return load_binary_scan(file_path)
+
+    cache_path = file_path + ".npz"
+    cache_is_fresh = os.path.exists(cache_path) and (
+        os.path.getmtime(cache_path) >= os.path.getmtime(file_path)
+    )
+    if cache_is_fresh:
+        try:
+            with np.load(cache_path) as cache:
+                if cache["version"] != CACHE_VERSION:
+                    raise ValueError(
+                        f"version {cache['version']}, expected {CACHE_VERSION}"
+                    )
+                return (
+                    cache["points"],
+                    cache["unique_names"],
+                    cache["label_ids"],
+                    cache["scanner_pos"],
+                    tuple(cache["scanner_rot_deg"]),
+                    float(cache["yaw_rad"]),
+                )
+        except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            # Truncated or outdated cache: parse the text again and rewrite it
+            print(
+                f"Warning: Ignoring outdated or unreadable scan cache '{cache_path}': {e}"
             )
-        else:
-            ax.plot_wireframe(
-                dome_x,
-                dome_y_up,
-                dome_z_depth,
-                color="gray",
-                alpha=0.3,
-                rstride=5,
-                cstride=5,
+
+    scanner_pos, scanner_rot_deg, yaw_rad = read_scan_header(file_path)
+    all_points, unique_names, label_ids = load_scan_points(file_path)
+
+    # Write to a temporary file next to the cache and move it into place, so
+    # an interrupted write never leaves a truncated cache behind.
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=CACHE_VERSION,
+                points=all_points,
+                unique_names=unique_names,
+                label_ids=label_ids,
+                scanner_pos=scanner_pos,
+                scanner_rot_deg=scanner_rot_deg,
+                yaw_rad=yaw_rad,
             )
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not write scan cache '{cache_path}': {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return all_points, unique_names, label_ids, scanner_pos, scanner_rot_deg, yaw_rad
+
+
+def voxel_downsample(all_points, label_ids, voxel_size):
+    """
+    Keeps one point per voxel_size cube. The integer voxel coordinates are
+    packed 21 bits per axis into one int64 key, so np.unique sorts plain
+    integers instead of rows.
+    """
+    keys = np.floor(all_points / voxel_size).astype(np.int64)
+    mask = (1 << 21) - 1
+    packed = (
+        ((keys[:, 0] & mask) << 42) | ((keys[:, 1] & mask) << 21) | (keys[:, 2] & mask)
+    )
+    _, keep = np.unique(packed, return_index=True)
+    return all_points[keep], label_ids[keep]
+
+
+def object_legend_handles(unique_names, colors):
+    """
+    Builds proxy legend entries for each object, since all objects share a
+    single scatter collection and carry no per-object label.
+    """
+    return [
+        Line2D([0], [0], marker="o", linestyle="", color=colors(i), label=name)
+        for i, name in enumerate(unique_names)
+    ]
+
 
-        # Plot the sensor origin
-        if Y_UP_DISPLAY:
-            ax.scatter(
-                0,
-                0,
-                0,
-                s=150,
-                color="black",
-                marker="x",
-                label="Sensor Origin",
-                depthshade=False,
+def render_matplotlib(fig, all_points, rgba, title, yaw_rad, unique_names, colors):
+    """
+    Draws the point cloud into fig with Matplotlib's mplot3d, together with
+    the front direction, the sensor's floor range and dome, and the origin.
+    all_points must already be in display axes (see to_display).
+    """
+    ax = fig.add_subplot(111, projection="3d")
+
+    # --- Plot all objects' points ---
+    # One scatter colored per point by label: a single collection for
+    # mplot3d to project instead of one per object. Depth shading is off
+    # so rotating doesn't recompute per-point alphas on every redraw, and
+    # the points are rasterized into one image layer (the dome, floor and
+    # origin stay vector) so vector output doesn't emit a path per point.
+    ax.scatter(
+        all_points[:, 0],
+        all_points[:, 1],
+        all_points[:, 2],
+        s=10,
+        c=rgba,
+        depthshade=False,
+        rasterized=True,
+    )
+
+    # --- Calculate max range and draw dome/floor ---
+    # Bounding statistics are computed once here and reused for the axis
+    # limits.
+    max_dist, mins, maxs, means = point_stats(all_points)
+    dome_radius = max_dist * 1.05  # Add a small buffer
+
+    # --- Draw Front Indicator Line (Rotated by Yaw) ---
+    # Godot's +Z is the initial front. Rotating it around the Y-up axis by the
+    # yaw keeps it on the floor (Y=0), so it's a simple 2D rotation:
+    # Rotation of (0,1) by yaw: x' = sin(yaw), z' = cos(yaw)
+    front = to_display(
+        np.array([np.sin(yaw_rad), 0, np.cos(yaw_rad)], np.float32) * dome_radius
+    )
+    ax.plot(
+        [0, front[0]],
+        [0, front[1]],
+        [0, front[2]],
+        color="red",
+        linewidth=2.5,
+        label="Front Direction",
+    )
+
+    # Create the floor circle
+    floor = dome_radius * UNIT_FLOOR
+    ax.plot(
+        floor[:, 0],
+        floor[:, 1],
+        floor[:, 2],
+        color="gray",
+        linestyle="--",
+        label="Sensor Floor Range",
+    )
+
+    # Create the hemisphere (dome). On dense scans the points already show
+    # the covered volume, so the dome is skipped to save its redraw cost.
+    # Only the faces turned towards the camera are drawn; they are picked
+    # once the view is set up below and again whenever it is rotated.
+    dome = None
+    if len(all_points) < DOME_POINT_LIMIT:
+        dome_faces = dome_radius * UNIT_DOME_FACES
+        dome = Poly3DCollection(
+            [],
+            facecolors=(0.5, 0.5, 0.5, 0.05),
+            edgecolors=(0.5, 0.5, 0.5, 0.3),
+            linewidths=1.0,
+        )
+        ax.add_collection3d(dome)
+
+    # Plot the sensor origin
+    ax.scatter(
+        0,
+        0,
+        0,
+        s=150,
+        color="black",
+        marker="x",
+        label="Sensor Origin",
+        depthshade=False,
+    )
+
+    # --- Customize the Plot ---
+    ax.set_title(title)
+
+    ax.set_xlabel(DISPLAY_LABELS[0])
+    ax.set_ylabel(DISPLAY_LABELS[1])
+    ax.set_zlabel(DISPLAY_LABELS[2])
+    # The object points share one scatter, so the legend gets a proxy entry
+    # per object next to the labeled sensor artists.
+    sensor_handles, _ = ax.get_legend_handles_labels()
+    ax.legend(
+        handles=sensor_handles + object_legend_handles(unique_names, colors),
+        loc="upper left",
+        bbox_to_anchor=(1.05, 1),
+    )
+    fig.tight_layout()
+    ax.view_init(elev=25, azim=45)
+
+    # --- Set equal aspect ratio ---
+    # Limits come straight from the point_stats bounds and the dome radius;
+    # no further passes over the points.
+    mid_x, mid_y, mid_z = means
+    max_range_plot = max(*(maxs - mins), dome_radius * 2)
+    half_range = max_range_plot / 2.0
+
+    ax.set_xlim(mid_x - half_range, mid_x + half_range)
+    ax.set_ylim(mid_y - half_range, mid_y + half_range)
+    if Y_UP_DISPLAY:
+        ax.set_zlim(0, max_range_plot)  # Y up from 0
+    else:
+        ax.set_zlim(mid_z - half_range, mid_z + half_range)
+    # Every axis spans max_range_plot, so a cubic box makes the scale truly
+    # equal (mplot3d's default box is 4:4:3).
+    ax.set_box_aspect((1, 1, 1))
+
+    if Y_UP_DISPLAY:
+        # Slight tweak of viewing angle so Y (up) reads naturally
+        ax.view_init(elev=20, azim=45)
+
+    if dome is not None:
+        dome_view = None
+
+        def cull_dome(event=None):
+            # Only re-filter when a rotation actually changed the view
+            nonlocal dome_view
+            if dome_view == (ax.elev, ax.azim):
+                return
+            dome_view = (ax.elev, ax.azim)
+            dome.set_verts(
+                visible_dome_faces(dome_faces, UNIT_DOME_NORMALS, ax.elev, ax.azim)
             )
-        else:
-            ax.scatter(
-                0,
-                0,
-                0,
-                s=150,
-                color="black",
-                marker="x",
-                label="Sensor Origin",
-                depthshade=False,
+
+        cull_dome()
+        fig.canvas.mpl_connect("motion_notify_event", cull_dome)
+
+    print("Displaying plot. Close the plot window to exit.")
+    plt.show()
+
+
+def render_vispy(fig, all_points, rgba, title):
+    """
+    Draws the point cloud with VisPy. The projection runs on the GPU in a
+    single draw call, which keeps large scans interactive where mplot3d
+    slows to a crawl. Only the points and the origin axes are shown.
+    The unused Matplotlib figure is closed once the VisPy window is up.
+    Returns False, leaving fig open, if VisPy has no usable GUI/GL backend.
+    """
+    try:
+        app.use_app()
+        canvas = scene.SceneCanvas(
+            keys="interactive",
+            size=(1400, 1000),
+            title=title.replace("\n", " | "),
+            show=True,
+        )
+    except Exception as e:
+        print(f"Warning: Could not open a VisPy window, using Matplotlib: {e}")
+        return False
+    plt.close(fig)
+    view = canvas.central_widget.add_view()
+    # The turntable camera is Z-up, same as Matplotlib
+    view.camera = "turntable"
+
+    markers = visuals.Markers()
+    markers.set_data(all_points, face_color=rgba, edge_width=0, size=3)
+    view.add(markers)
+    # Sensor origin
+    visuals.XYZAxis(parent=view.scene)
+    view.camera.set_range()
+
+    print("Displaying plot. Close the plot window to exit.")
+    app.run()
+    return True
+
+
+def visualize_point_cloud(file_path, voxel_size=VOXEL_SIZE):
+    """
+    Loads and displays a categorized 3D point cloud as a scatter plot,
+    visualizing the sensor's range with a dome and floor. If voxel_size is
+    given, the cloud is first thinned to one point per voxel of that size.
+    """
+    if not os.path.exists(file_path):
+        print(f"Error: File not found at '{file_path}'")
+        return
+
+    try:
+        # Load the scan on a worker thread while the main thread brings up
+        # the Matplotlib backend (GUI toolkit, font cache), which does not
+        # depend on the data. Keep every point in one contiguous (N, 3)
+        # array, tagged with an integer label that indexes into unique_names.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            scan_future = executor.submit(load_scan, file_path)
+            # Let Agg split long paths into chunks instead of rendering them in one go
+            plt.rcParams["agg.path.chunksize"] = 10000
+            fig = plt.figure(figsize=(14, 10))
+            (
+                all_points,
+                unique_names,
+                label_ids,
+                scanner_pos,
+                scanner_rot_deg,
+                yaw_rad,
+            ) = scan_future.result()
+
+        if len(all_points) == 0:
+            print(f"Error: No valid point data found in '{file_path}'.")
+            plt.close(fig)
+            return
+
+        # Reorder into display axes once (a fresh contiguous copy, so later
+        # column reads are stride-1), then make the points relative to the
+        # scanner's position in place.
+        all_points = all_points[:, DISPLAY_ORDER]
+        all_points -= scanner_pos.astype(np.float32)[DISPLAY_ORDER]
+        all_points *= DISPLAY_SIGN
+
+        if voxel_size:
+            point_count = len(all_points)
+            all_points, label_ids = voxel_downsample(all_points, label_ids, voxel_size)
+            print(
+                f"Voxel downsampled {point_count} points to {len(all_points)} "
+                f"({voxel_size} m voxels)."
             )
 
-        # --- Customize the Plot ---
+        # --- Title and colors shared by both renderers ---
         title = "LiDAR Point Cloud and Sensor Range"
         pos_str = (
             f"Pos: ({scanner_pos[0]:.2f}, {scanner_pos[1]:.2f}, {scanner_pos[2]:.2f})"
@@ -200,52 +820,14 @@ def visualize_point_cloud(file_path):
             f"Rot (Yaw/Pitch): ({scanner_rot_deg[0]:.1f}°, {scanner_rot_deg[1]:.1f}°)"
         )
         title += f"\nScan from {pos_str} | {rot_str}"
-        ax.set_title(title)
+        colors = plt.get_cmap("gist_rainbow", len(unique_names))
+        rgba = colors(label_ids)
 
-        if Y_UP_DISPLAY:
-            ax.set_xlabel("X (Right)")
-            ax.set_ylabel("Z (Forward/Depth)")
-            ax.set_zlabel("Y (Up)")
-        else:
-            ax.set_xlabel("X")
-            ax.set_ylabel("Y")
-            ax.set_zlabel("Z")
-        # ax.legend(loc="upper left", bbox_to_anchor=(1.05, 1))
-        fig.tight_layout()
-        ax.view_init(elev=25, azim=45)
-
-        # --- Set equal aspect ratio ---
-        if Y_UP_DISPLAY:
-            # x -> x, depth -> z, up -> y
-            x_coords = all_points[:, 0]
-            y_coords = all_points[:, 2]  # depth
-            z_coords = all_points[:, 1]  # up
-        else:
-            x_coords = all_points[:, 0]
-            y_coords = all_points[:, 1]
-            z_coords = all_points[:, 2]
-        mid_x, mid_y, mid_z = np.mean(x_coords), np.mean(y_coords), np.mean(z_coords)
-        max_range_plot = max(
-            x_coords.max() - x_coords.min(),
-            y_coords.max() - y_coords.min(),
-            z_coords.max() - z_coords.min(),
-            dome_radius * 2,
-        )
-        half_range = max_range_plot / 2.0
-
-        ax.set_xlim(mid_x - half_range, mid_x + half_range)
-        ax.set_ylim(mid_y - half_range, mid_y + half_range)
-        if Y_UP_DISPLAY:
-            ax.set_zlim(0, max_range_plot)  # Y up from 0
-        else:
-            ax.set_zlim(mid_z - half_range, mid_z + half_range)
-
-        if Y_UP_DISPLAY:
-            # Slight tweak of viewing angle so Y (up) reads naturally
-            ax.view_init(elev=20, azim=45)
-
-        print("Displaying plot. Close the plot window to exit.")
-        plt.show()
+        use_vispy = len(all_points) > VISPY_POINT_LIMIT and scene is not None
+        if not (use_vispy and render_vispy(fig, all_points, rgba, title)):
+            render_matplotlib(
+                fig, all_points, rgba, title, yaw_rad, unique_names, colors
+            )
 
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -269,8 +851,12 @@ def main():
             )
             return
 
-        search_pattern = os.path.join(scan_dir, "point_cloud_categorized_*.txt")
-        scan_files = glob.glob(search_pattern)
+        scan_files = []
+        for extension in ("txt", "bin"):
+            search_pattern = os.path.join(
+                scan_dir, f"point_cloud_categorized_*.{extension}"
+            )
+            scan_files += glob.glob(search_pattern)
 
         if not scan_files:
             print(